@@ -1,28 +1,139 @@
 """Generate reference pages for the documentation."""
 
-from pathlib import Path
-from typing import TYPE_CHECKING
+import hashlib
+import heapq
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 
 if TYPE_CHECKING:
     import mkdocs.config.defaults  # pragma: no cover
 
 
-SKIPPED_MODULES = ("fastapi_sso.sso", "fastapi_sso")
-
-
-def generate_reference_pages(docs_dir: str, nav: list):
-    """Generate reference pages for the documentation."""
-    reference_path = Path(docs_dir, "reference")
-    reference_path.mkdir(exist_ok=True)
-    source_path = Path("./fastapi_sso")
+SOURCE_ROOT = os.path.normpath("./fastapi_sso")
+EXAMPLES_ROOT = os.path.normpath("./examples")
+SKIPPED_MODULES = frozenset(("fastapi_sso.sso", "fastapi_sso"))
+# Source files of the skipped modules, so they can be rejected before their import path is derived
+SKIPPED_MODULE_FILES = frozenset(
+    path
+    for module in SKIPPED_MODULES
+    for path in (os.path.join(*module.split("."), "__init__.py"), os.path.join(*module.split(".")) + ".py")
+)
+MANIFEST_PATH = os.path.join(".cache", "fastapi_sso_docs_manifest.json")
+GENERATOR_KEY = "__generator__"
+EXAMPLES_HEADER = b"# Examples\n\n"
+EXAMPLE_HEADING = b"## "
+EXAMPLE_CODE_OPEN = b"\n\n```python\n"
+EXAMPLE_CODE_CLOSE = b"\n```\n\n"
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+Manifest = Dict[str, Dict[str, str]]
+
+
+def _walk_py(roots: List[str], visitor: Callable[[str, str], None]) -> None:
+    """Call `visitor(root, path)` for every python file under any of `roots` (in no particular order).
+
+    All roots are walked in a single pass with `os.scandir`, relying on the cached `DirEntry`
+    type information, so no extra `stat` calls are issued per file.
+    """
+    stack = [(root, root) for root in roots]
+    while stack:
+        root, directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((root, entry.path))
+                elif entry.name.endswith(".py"):
+                    visitor(root, entry.path)
+
+
+def _find_py(*roots: str) -> Dict[str, List[str]]:
+    """Return sorted python file paths found under each of `roots`, keyed by root.
+
+    Files are sorted per directory (a handful of entries each) and the sorted chunks
+    are then merged, instead of sorting every path of the tree at once.
+    """
+    chunks: Dict[str, Dict[str, List[str]]] = {root: {} for root in roots}
+    _walk_py(list(roots), lambda root, path: chunks[root].setdefault(os.path.dirname(path), []).append(path))
+    return {root: list(heapq.merge(*map(sorted, directories.values()))) for root, directories in chunks.items()}
+
+
+def _write_if_changed(path: str, content: bytes) -> bool:
+    """Write `content` to `path` unless the file already holds exactly that content.
+
+    Returns:
+        bool: True if the file was (re)written.
+    """
+    if os.path.isfile(path) and _read_bytes(path) == content:
+        return False
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(content)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+    return True
+
+
+def _read_bytes(path: str) -> bytes:
+    """Return the raw content of the file at `path`."""
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def _file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of the file at `path`."""
+    return hashlib.sha256(_read_bytes(path)).hexdigest()
+
+
+def load_manifest() -> Manifest:
+    """Load the build manifest mapping generated example pages to the digests of their sources.
+
+    The manifest is discarded whenever this generator itself has changed.
+    """
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as file:
+            manifest: Manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get(GENERATOR_KEY) != {__file__: _file_digest(__file__)}:
+        return {}
+    return manifest
+
+
+def save_manifest(manifest: Manifest) -> None:
+    """Persist the build manifest for the next documentation build."""
+    manifest[GENERATOR_KEY] = {__file__: _file_digest(__file__)}
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+
+def _is_fresh(manifest: Manifest, output: str, sources: Dict[str, str]) -> bool:
+    """Check whether `output` exists and was generated from exactly these `sources`."""
+    return manifest.get(output) == sources and os.path.isfile(output)
+
+
+def generate_reference_pages(docs_dir: str, nav: list, paths: Optional[List[str]] = None):
+    """Generate reference pages for the documentation.
+
+    Each page only holds the `::: import.path` directive, so unchanged pages are skipped by comparing
+    their content, without reading the modules they document.
+    """
+    paths = _find_py(SOURCE_ROOT)[SOURCE_ROOT] if paths is None else paths
+    # doc paths are flat dotted names, so every page lives directly in the reference directory
+    ref_prefix = os.path.join(docs_dir, "reference") + os.sep
+    nav_prefix = "reference/"
+    os.makedirs(ref_prefix, exist_ok=True)
     reference_nav = []
-    for path in sorted(source_path.rglob("*.py")):
-        module_path = path.relative_to(".").with_suffix("")
-        doc_path = str(path.relative_to(source_path).with_suffix(".md")).replace("/", ".")
-        full_doc_path = reference_path / doc_path
-        nav_path = (reference_path / doc_path).relative_to(docs_dir).as_posix()
-
-        parts = module_path.parts
+    src_depth = len(SOURCE_ROOT.split(os.sep))
+    for file_path in paths:
+        if file_path in SKIPPED_MODULE_FILES:
+            continue
+        module_parts = file_path[:-3].split(os.sep)
+        parts = module_parts
 
         if parts[-1] == "__init__":
             if len(parts) == 1:
@@ -34,31 +145,42 @@ def generate_reference_pages(docs_dir: str, nav: list):
 
         import_path = ".".join(parts)
 
-        if import_path in SKIPPED_MODULES:
-            continue
-
-        full_doc_path.parent.mkdir(exist_ok=True, parents=True)
-        with open(full_doc_path, "w", encoding="utf-8") as file:
-            file.write(f"::: {import_path}\n")
+        doc_path = ".".join(module_parts[src_depth:]) + ".md"
+        full_doc_path = ref_prefix + doc_path
+        _write_if_changed(full_doc_path, f"::: {import_path}\n".encode())
 
-        reference_nav.append({import_path: Path(nav_path).as_posix()})
+        reference_nav.append({import_path: nav_prefix + doc_path})
     nav.append({"Reference": reference_nav})
 
 
-def generate_example_pages(docs_dir: str, nav: list):
+def _example_title(file_path: str) -> bytes:
+    """Return the encoded section title for an example file."""
+    return os.path.splitext(os.path.basename(file_path))[0].replace("_", " ").title().encode()
+
+
+def generate_example_pages(
+    docs_dir: str, nav: list, manifest: Optional[Manifest] = None, paths: Optional[List[str]] = None
+):
     """Generate example pages for the documentation."""
-    examples_path = Path(docs_dir, "examples.md")
-    source_path = Path("./examples")
-    examples_path.unlink(missing_ok=True)
-    with examples_path.open("w", encoding="utf-8") as file:
-        file.write("# Examples\n\n")
-        for path in sorted(source_path.rglob("*.py")):
-            page_title = path.stem.replace("_", " ").title()
-            file.write(f"## {page_title}\n\n```python\n{path.read_text(encoding='utf-8')}\n```\n\n")
+    manifest = {} if manifest is None else manifest
+    example_paths = _find_py(EXAMPLES_ROOT)[EXAMPLES_ROOT] if paths is None else paths
+    examples_path = os.path.join(docs_dir, "examples.md")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        examples = dict(zip(example_paths, executor.map(_read_bytes, example_paths)))
+    sources = {file_path: hashlib.sha256(content).hexdigest() for file_path, content in examples.items()}
+    if not _is_fresh(manifest, examples_path, sources):
+        chunks = [EXAMPLES_HEADER]
+        for file_path, content in examples.items():
+            chunks += (EXAMPLE_HEADING, _example_title(file_path), EXAMPLE_CODE_OPEN, content, EXAMPLE_CODE_CLOSE)
+        _write_if_changed(examples_path, b"".join(chunks))
+        manifest[examples_path] = sources
     nav.append({"Examples": "examples.md"})
 
 
 def on_config(config: "mkdocs.config.defaults.MkDocsConfig"):
     """Generate reference pages for the documentation."""
-    generate_example_pages(config.docs_dir, config.nav)
-    generate_reference_pages(config.docs_dir, config.nav)
+    manifest = load_manifest()
+    found = _find_py(EXAMPLES_ROOT, SOURCE_ROOT)
+    generate_example_pages(config.docs_dir, config.nav, manifest, found[EXAMPLES_ROOT])
+    generate_reference_pages(config.docs_dir, config.nav, found[SOURCE_ROOT])
+    save_manifest(manifest)
@@ -3,23 +3,63 @@
 (such as Facebook login, Google login and login via Microsoft Office 365 account)
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
 from .sso.base import OpenID, SSOBase, SSOLoginError
-from .sso.bitbucket import BitbucketSSO
-from .sso.discord import DiscordSSO
-from .sso.facebook import FacebookSSO
-from .sso.fitbit import FitbitSSO
-from .sso.generic import create_provider
-from .sso.github import GithubSSO
-from .sso.gitlab import GitlabSSO
-from .sso.google import GoogleSSO
-from .sso.kakao import KakaoSSO
-from .sso.line import LineSSO
-from .sso.linkedin import LinkedInSSO
-from .sso.microsoft import MicrosoftSSO
-from .sso.naver import NaverSSO
-from .sso.notion import NotionSSO
-from .sso.spotify import SpotifySSO
-from .sso.twitter import TwitterSSO
+
+if TYPE_CHECKING:
+    from .sso.bitbucket import BitbucketSSO  # pragma: no cover
+    from .sso.discord import DiscordSSO  # pragma: no cover
+    from .sso.facebook import FacebookSSO  # pragma: no cover
+    from .sso.fitbit import FitbitSSO  # pragma: no cover
+    from .sso.generic import create_provider  # pragma: no cover
+    from .sso.github import GithubSSO  # pragma: no cover
+    from .sso.gitlab import GitlabSSO  # pragma: no cover
+    from .sso.google import GoogleSSO  # pragma: no cover
+    from .sso.kakao import KakaoSSO  # pragma: no cover
+    from .sso.line import LineSSO  # pragma: no cover
+    from .sso.linkedin import LinkedInSSO  # pragma: no cover
+    from .sso.microsoft import MicrosoftSSO  # pragma: no cover
+    from .sso.naver import NaverSSO  # pragma: no cover
+    from .sso.notion import NotionSSO  # pragma: no cover
+    from .sso.spotify import SpotifySSO  # pragma: no cover
+    from .sso.twitter import TwitterSSO  # pragma: no cover
+
+# Providers are imported lazily on first access, so that an application only pays for the ones it uses
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "BitbucketSSO": ".sso.bitbucket",
+    "DiscordSSO": ".sso.discord",
+    "FacebookSSO": ".sso.facebook",
+    "FitbitSSO": ".sso.fitbit",
+    "create_provider": ".sso.generic",
+    "GithubSSO": ".sso.github",
+    "GitlabSSO": ".sso.gitlab",
+    "GoogleSSO": ".sso.google",
+    "KakaoSSO": ".sso.kakao",
+    "LineSSO": ".sso.line",
+    "LinkedInSSO": ".sso.linkedin",
+    "MicrosoftSSO": ".sso.microsoft",
+    "NaverSSO": ".sso.naver",
+    "NotionSSO": ".sso.notion",
+    "SpotifySSO": ".sso.spotify",
+    "TwitterSSO": ".sso.twitter",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import providers lazily upon first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List lazily imported providers alongside the regular module attributes."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "OpenID",
@@ -1,17 +1,36 @@
 """SSO login base dependency."""
 
 import asyncio
-import json
 import logging
 import os
 import sys
+import time
 import warnings
+from contextlib import asynccontextmanager
 from types import TracebackType
-from typing import Any, ClassVar, Dict, List, Literal, Optional, Type, TypedDict, TypeVar, Union, overload
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypedDict,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+from urllib.parse import urlencode
 
 import httpx
 import pydantic
-from oauthlib.oauth2 import WebApplicationClient
+from oauthlib.common import add_params_to_uri
+from oauthlib.oauth2 import InsecureTransportError, WebApplicationClient
+from oauthlib.oauth2.rfc6749.utils import is_secure_transport, list_to_scope
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
@@ -19,6 +38,11 @@ from starlette.responses import RedirectResponse
 from fastapi_sso.pkce import get_pkce_challenge_pair
 from fastapi_sso.state import generate_random_state
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 if sys.version_info < (3, 10):
     from typing import Callable  # pragma: no cover
 
@@ -29,6 +53,19 @@ else:
 
 logger = logging.getLogger(__name__)
 
+# Discovery documents fetched from well-known URLs, shared by all SSO instances: url -> (document, expires at)
+_shared_discovery_documents: Dict[str, Tuple["DiscoveryDocument", float]] = {}
+
+# Fetches of shared discovery documents in progress, joined by concurrent callers: (event loop, url) -> fetch
+_pending_discovery_fetches: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Future[DiscoveryDocument]"] = {}
+
+# Seconds to keep serving an expired discovery document after refreshing it failed, before trying again
+_DISCOVERY_RETRY_INTERVAL = 60.0
+
+# Same header `Response.set_cookie("pkce_code_verifier", ...)` produces by default, built without SimpleCookie
+_PKCE_COOKIE_PREFIX = b"pkce_code_verifier="
+_PKCE_COOKIE_SUFFIX = b"; Path=/; SameSite=lax"
+
 T = TypeVar("T")
 P = ParamSpec("P")
 
@@ -72,6 +109,49 @@ class SecurityWarning(UserWarning):
     """Raised when insecure usage is detected"""
 
 
+def json_from_response(response: httpx.Response) -> Any:
+    """Decodes the JSON body of a response, using `orjson` if it is installed.
+
+    Args:
+        response (httpx.Response): The response to decode.
+
+    Returns:
+        Any: The decoded JSON content.
+    """
+    if orjson is None:
+        return response.json()
+    return orjson.loads(response.content)
+
+
+class _AuthenticatedClient:
+    """Wraps a shared `httpx.AsyncClient`, sending one login's auth headers with every request made through it.
+
+    The headers are never set on the shared client itself, so that tokens of one user never leak into requests
+    made for another.
+    """
+
+    _methods_with_headers = frozenset(
+        ("request", "stream", "build_request", "get", "options", "head", "post", "put", "patch", "delete")
+    )
+
+    def __init__(self, client: httpx.AsyncClient, headers: Dict[str, Any]) -> None:
+        self._client = client
+        self.headers = httpx.Headers(headers)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if name not in self._methods_with_headers:
+            return attribute
+
+        def with_headers(*args: Any, headers: Any = None, **kwargs: Any) -> Any:
+            merged = httpx.Headers(self.headers)
+            if headers:
+                merged.update(headers)
+            return attribute(*args, headers=merged, **kwargs)
+
+        return with_headers
+
+
 def requires_async_context(func: Callable[P, T]) -> Callable[P, T]:
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
         if not args or not isinstance(args[0], SSOBase):
@@ -99,9 +179,26 @@ class SSOBase:
     additional_headers: ClassVar[Optional[Dict[str, Any]]] = None
     uses_pkce: bool = False
     requires_state: bool = False
+    discovery_ttl: float = 3600.0
+    # Endpoints of providers whose discovery document never changes, used unless `get_discovery_document` is overridden
+    discovery_document: ClassVar[Optional[DiscoveryDocument]] = None
+
+    # Maps `OpenID` fields to top-level userinfo keys for providers that need no further processing
+    _openid_field_map: ClassVar[Optional[Dict[str, str]]] = None
+    _openid_fields: ClassVar[Tuple[Tuple[str, str], ...]] = ()
 
     _pkce_challenge_length: int = 96
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Validates and freezes `_openid_field_map` once per provider class, rather than on every login."""
+        super().__init_subclass__(**kwargs)
+        if cls._openid_field_map is None:
+            return
+        unknown = set(cls._openid_field_map) - (set(OpenID.__annotations__) - {"provider"})
+        if unknown:
+            raise ValueError(f"{cls.__name__!r} maps unknown OpenID fields: {', '.join(sorted(unknown))}")
+        cls._openid_fields = tuple(cls._openid_field_map.items())
+
     def __init__(
         self,
         client_id: str,
@@ -110,12 +207,32 @@ class SSOBase:
         allow_insecure_http: bool = False,
         use_state: bool = False,
         scope: Optional[List[str]] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        discovery_ttl: Optional[float] = None,
     ):
-        """Base class (mixin) for all SSO providers."""
+        """Base class (mixin) for all SSO providers.
+
+        Args:
+            client_id (str): The client ID issued by the provider.
+            client_secret (str): The client secret issued by the provider.
+            redirect_uri (Optional[Union[pydantic.AnyHttpUrl, str]]): The default callback URL.
+            allow_insecure_http (bool): Allow plain `http` callbacks (for local development only).
+            use_state (bool): Deprecated, use the `state` argument of individual methods instead.
+            scope (Optional[List[str]]): Overrides the default scope of the provider.
+            http_client (Optional[httpx.AsyncClient]): A long-lived client to make all provider requests with,
+                so that connections are kept alive and reused across logins. The caller owns the client and
+                is responsible for closing it. If not given, a new client is created for every login.
+            discovery_ttl (Optional[float]): Seconds to reuse a discovery document fetched from the provider for,
+                0 disables the cache.
+                Defaults to the `discovery_ttl` of the class.
+        """
         self.client_id: str = client_id
         self.client_secret: str = client_secret
         self.redirect_uri: Optional[Union[pydantic.AnyHttpUrl, str]] = redirect_uri
         self.allow_insecure_http: bool = allow_insecure_http
+        self.http_client: Optional[httpx.AsyncClient] = http_client
+        if discovery_ttl is not None:
+            self.discovery_ttl = discovery_ttl
         self._login_lock = asyncio.Lock()
         self._in_stack = False
         self._oauth_client: Optional[WebApplicationClient] = None
@@ -123,7 +240,9 @@ class SSOBase:
 
         if self.allow_insecure_http:
             logger.debug("Initializing %s with allow_insecure_http=True", self.__class__.__name__)
-            os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
+            if not os.environ.get("OAUTHLIB_INSECURE_TRANSPORT"):
+                # Write the process-wide environment only once, not on every construction
+                os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
 
         # TODO: Remove use_state argument and attribute
         if use_state:
@@ -138,9 +257,12 @@ class SSOBase:
         self._refresh_token: Optional[str] = None
         self._id_token: Optional[str] = None
         self._state: Optional[str] = None
+        self._state_warned = False
         self._pkce_code_challenge: Optional[str] = None
         self._pkce_code_verifier: Optional[str] = None
         self._pkce_challenge_method = "S256"
+        self._auth_headers: Dict[str, Any] = {}
+        self._basic_auth: Optional[Tuple[Tuple[str, str], httpx.BasicAuth]] = None
 
     @property
     def state(self) -> Optional[str]:
@@ -149,12 +271,13 @@ class SSOBase:
         Warning:
             This will emit a warning if the state is unset, implying either that
             the server didn't return a state or `verify_and_process` hasn't been
-            called yet.
+            called yet. The warning is emitted only once per login flow.
 
         Returns:
             Optional[str]: The state parameter returned from the server.
         """
-        if self._state is None:
+        if self._state is None and not self._state_warned:
+            self._state_warned = True
             warnings.warn(
                 "'state' parameter is unset. This means the server either "
                 "didn't return state (was this expected?) or 'verify_and_process' hasn't been called yet.",
@@ -173,12 +296,23 @@ class SSOBase:
         Returns:
             WebApplicationClient: OAuth client instance.
         """
-        if self.client_id == NotImplemented:
-            raise NotImplementedError(f"Provider {self.provider} not supported")  # pragma: no cover
         if self._oauth_client is None:
-            self._oauth_client = WebApplicationClient(self.client_id)
+            self._oauth_client = self._make_oauth_client()
         return self._oauth_client
 
+    def _make_oauth_client(self) -> WebApplicationClient:
+        """Creates a new OAuth client, private to a single step of the login flow.
+
+        Raises:
+            NotImplementedError: If the provider is not supported or `client_id` is not set.
+
+        Returns:
+            WebApplicationClient: A fresh OAuth client instance.
+        """
+        if self.client_id == NotImplemented:
+            raise NotImplementedError(f"Provider {self.provider} not supported")  # pragma: no cover
+        return WebApplicationClient(self.client_id)
+
     @property
     @requires_async_context
     def access_token(self) -> Optional[str]:
@@ -189,6 +323,16 @@ class SSOBase:
         """
         return self.oauth_client.access_token
 
+    @property
+    @requires_async_context
+    def auth_headers(self) -> Dict[str, Any]:
+        """Retrieves the headers authenticating requests to the provider's API for the current login.
+
+        Returns:
+            Dict[str, Any]: The headers, empty until `process_login` obtained a token.
+        """
+        return self._auth_headers
+
     @property
     @requires_async_context
     def refresh_token(self) -> Optional[str]:
@@ -209,12 +353,30 @@ class SSOBase:
         """
         return self._id_token
 
+    def _get_basic_auth(self) -> httpx.BasicAuth:
+        """Returns the client credentials as `httpx.BasicAuth`, encoded only once per credentials pair."""
+        credentials = (self.client_id, self.client_secret)
+        if self._basic_auth is None or self._basic_auth[0] != credentials:
+            self._basic_auth = (credentials, httpx.BasicAuth(*credentials))
+        return self._basic_auth[1]
+
+    @asynccontextmanager
+    async def _http_session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yields the shared `http_client` if one was given, otherwise a new client closed upon exit."""
+        if self.http_client is not None:
+            yield self.http_client
+            return
+        async with httpx.AsyncClient() as session:
+            yield session
+
     async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         """Converts a response from the provider's user info endpoint to an OpenID object.
 
         Args:
             response (dict): The response from the user info endpoint.
-            session (Optional[httpx.AsyncClient]): The HTTPX AsyncClient session.
+            session (Optional[httpx.AsyncClient]): The HTTPX AsyncClient session. When a shared `http_client` is
+                used, this is a proxy sending the login's auth headers: it forwards attributes and request methods,
+                but it is not an `httpx.AsyncClient` instance and cannot be used with `async with`.
 
         Raises:
             NotImplementedError: If the provider is not supported.
@@ -222,7 +384,9 @@ class SSOBase:
         Returns:
             OpenID: The user information in a standardized format.
         """
-        raise NotImplementedError(f"Provider {self.provider} not supported")
+        if self._openid_field_map is None:
+            raise NotImplementedError(f"Provider {self.provider} not supported")
+        return OpenID(provider=self.provider, **{field: response.get(key) for field, key in self._openid_fields})
 
     async def get_discovery_document(self) -> DiscoveryDocument:
         """Retrieves the discovery document containing useful URLs.
@@ -233,24 +397,115 @@ class SSOBase:
         Returns:
             DiscoveryDocument: A dictionary containing important endpoints like authorization, token and userinfo.
         """
+        if self.discovery_document is not None:
+            return self.discovery_document.copy()
         raise NotImplementedError(f"Provider {self.provider} not supported")
 
+    async def _resolve_discovery_document(self) -> DiscoveryDocument:
+        """Retrieves the discovery document, using the static `discovery_document` directly if there is one.
+
+        Documents built locally by `get_discovery_document` overrides are not cached, as they may depend on
+        instance attributes that change, only documents fetched over the network are.
+        The static document is shared and must not be modified.
+
+        Returns:
+            DiscoveryDocument: A dictionary containing important endpoints like authorization, token and userinfo.
+        """
+        if self.discovery_document is not None and type(self).get_discovery_document is SSOBase.get_discovery_document:
+            return self.discovery_document
+        return await self.get_discovery_document()
+
+    async def prefetch_discovery_document(self) -> DiscoveryDocument:
+        """Fetches the discovery document ahead of the first login and validates its endpoints.
+
+        Call it on application startup, e.g. in FastAPI's lifespan, so that the first login doesn't pay for
+        the discovery round trip and a misconfigured provider fails early instead of on a user's callback.
+
+        Raises:
+            ValueError: If the document lacks an endpoint or an endpoint doesn't use `https` while
+                `allow_insecure_http` is not set.
+
+        Returns:
+            DiscoveryDocument: A dictionary containing important endpoints like authorization, token and userinfo.
+        """
+        discovery = await self._resolve_discovery_document()
+        for key in ("authorization_endpoint", "token_endpoint", "userinfo_endpoint"):
+            endpoint = discovery.get(key)
+            if not endpoint:
+                raise ValueError(f"Discovery document of {self.provider!r} is missing {key!r}")
+            if not self.allow_insecure_http and not is_secure_transport(endpoint):
+                raise ValueError(f"{key!r} of {self.provider!r} must use https, got {endpoint!r}")
+        return discovery
+
+    async def _fetch_shared_discovery_document(self, url: str) -> DiscoveryDocument:
+        """Fetches the discovery document from `url`, sharing it with all instances for `discovery_ttl` seconds.
+
+        Concurrent calls for the same `url` wait for a single request instead of each making their own.
+        If refreshing an expired document fails, the expired one keeps being used and the refresh
+        is retried at most once per `_DISCOVERY_RETRY_INTERVAL` seconds.
+        Only suitable for documents that depend on nothing but their URL, such as `.well-known/openid-configuration`.
+
+        Args:
+            url (str): The URL of the discovery document.
+
+        Raises:
+            httpx.HTTPStatusError: If the provider didn't respond successfully. Error responses are never cached.
+
+        Returns:
+            DiscoveryDocument: A dictionary containing important endpoints like authorization, token and userinfo.
+        """
+        cached = _shared_discovery_documents.get(url)
+        if cached is not None and time.monotonic() < cached[1] and self.discovery_ttl > 0:
+            return cached[0]
+        key = (asyncio.get_running_loop(), url)
+        fetch = _pending_discovery_fetches.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._download_shared_discovery_document(url))
+            _pending_discovery_fetches[key] = fetch
+
+            def _forget(done: "asyncio.Future[DiscoveryDocument]") -> None:
+                _pending_discovery_fetches.pop(key, None)
+                if not done.cancelled():
+                    done.exception()  # Mark as retrieved in case every caller was cancelled
+
+            fetch.add_done_callback(_forget)
+        try:
+            # Shielded so that a cancelled caller doesn't cancel the fetch for the others
+            return await asyncio.shield(fetch)
+        except Exception:
+            if cached is None or self.discovery_ttl <= 0:
+                raise
+            logger.warning("Refreshing discovery document from %s failed, reusing the expired one", url)
+            retry_at = time.monotonic() + min(self.discovery_ttl, _DISCOVERY_RETRY_INTERVAL)
+            _shared_discovery_documents[url] = (cached[0], retry_at)
+            return cached[0]
+
+    async def _download_shared_discovery_document(self, url: str) -> DiscoveryDocument:
+        """Downloads the discovery document from `url` and shares it with all instances."""
+        now = time.monotonic()
+        async with self._http_session() as session:
+            response = await session.get(url)
+            response.raise_for_status()
+            document = json_from_response(response)
+        _shared_discovery_documents[url] = (document, now + self.discovery_ttl)
+        return document
+
     @property
     async def authorization_endpoint(self) -> Optional[str]:
         """Return `authorization_endpoint` from discovery document."""
-        discovery = await self.get_discovery_document()
+        discovery = await self._resolve_discovery_document()
         return discovery.get("authorization_endpoint")
 
     @property
     async def token_endpoint(self) -> Optional[str]:
         """Return `token_endpoint` from discovery document."""
-        discovery = await self.get_discovery_document()
+        discovery = await self._resolve_discovery_document()
         return discovery.get("token_endpoint")
 
     @property
     async def userinfo_endpoint(self) -> Optional[str]:
         """Return `userinfo_endpoint` from discovery document."""
-        discovery = await self.get_discovery_document()
+        discovery = await self._resolve_discovery_document()
         return discovery.get("userinfo_endpoint")
 
     async def get_login_url(
@@ -289,16 +544,39 @@ class SSOBase:
                     "generated automatically. Use SSO as a context manager. The login process will most probably fail."
                 )
             state = self._generated_state
-        request_uri = self.oauth_client.prepare_request_uri(
-            await self.authorization_endpoint,
-            redirect_uri=redirect_uri,
-            state=state,
-            scope=self._scope,
-            code_challenge=self._pkce_code_challenge,
-            code_challenge_method=self._pkce_challenge_method,
-            **params,
-        )
-        return request_uri
+        query: List[Tuple[str, Any]] = [
+            ("response_type", "code"),
+            ("client_id", self.client_id),
+            ("redirect_uri", redirect_uri),
+        ]
+        if self._scope:
+            query.append(("scope", list_to_scope(self._scope)))
+        if state:
+            query.append(("state", state))
+        if self._pkce_code_challenge is not None:
+            query.append(("code_challenge", self._pkce_code_challenge))
+            query.append(("code_challenge_method", self._pkce_challenge_method))
+        query.extend((key, value) for key, value in params.items() if value)
+        discovery = await self._resolve_discovery_document()
+        return self._build_login_uri(discovery["authorization_endpoint"], query)
+
+    @staticmethod
+    def _build_login_uri(authorization_endpoint: str, query: List[Tuple[str, Any]]) -> str:
+        """Appends the authorization request parameters to the authorization endpoint.
+
+        Builds the same URL as oauthlib's `WebApplicationClient.prepare_request_uri`, with a single `urlencode` call.
+
+        Raises:
+            InsecureTransportError: If the endpoint is not `https` and insecure transport was not allowed.
+        """
+        if not is_secure_transport(authorization_endpoint):
+            raise InsecureTransportError()
+        if "#" in authorization_endpoint:
+            return add_params_to_uri(authorization_endpoint, query)
+        base, _, existing = authorization_endpoint.partition("?")
+        existing = existing.strip("&")
+        encoded = urlencode(query)
+        return f"{base}?{existing}&{encoded}" if existing else f"{base}?{encoded}"
 
     async def get_login_redirect(
         self,
@@ -322,7 +600,8 @@ class SSOBase:
         login_uri = await self.get_login_url(redirect_uri=redirect_uri, params=params, state=state)
         response = RedirectResponse(login_uri, 303)
         if self.uses_pkce:
-            response.set_cookie("pkce_code_verifier", str(self._pkce_code_verifier))
+            cookie = _PKCE_COOKIE_PREFIX + str(self._pkce_code_verifier).encode("latin-1") + _PKCE_COOKIE_SUFFIX
+            response.raw_headers.append((b"set-cookie", cookie))
         return response
 
     @overload
@@ -412,6 +691,8 @@ class SSOBase:
         self._refresh_token = None
         self._id_token = None
         self._state = None
+        self._state_warned = False
+        self._auth_headers = {}
         if self.requires_state:
             self._generated_state = generate_random_state()
         if self.uses_pkce:
@@ -425,6 +706,8 @@ class SSOBase:
         self._refresh_token = None
         self._id_token = None
         self._state = None
+        self._state_warned = False
+        self._auth_headers = {}
         if self.requires_state:
             self._generated_state = generate_random_state()
         if self.uses_pkce:
@@ -520,27 +803,32 @@ class SSOBase:
                 ),
                 ReusedOauthClientWarning,
             )
-        params = params or {}
-        params.update(self._extra_query_params)
-        additional_headers = additional_headers or {}
-        additional_headers.update(self.additional_headers or {})
+        params = {**params, **self._extra_query_params} if params else dict(self._extra_query_params)
+        if additional_headers:
+            additional_headers = {**additional_headers, **(self.additional_headers or {})}
+        else:
+            # Only ever read below, so the provider's headers need no copy
+            additional_headers = self.additional_headers or {}
 
         url = request.url
 
         if not self.allow_insecure_http and url.scheme != "https":
-            current_url = str(url).replace("http://", "https://")
+            current_url = str(url.replace(scheme="https"))
         else:
             current_url = str(url)
 
-        current_path = f"{url.scheme}://{url.netloc}{url.path}"
-
         if pkce_code_verifier:
-            params.update({"code_verifier": pkce_code_verifier})
+            params["code_verifier"] = pkce_code_verifier
+
+        # Resolve both endpoints from a single discovery lookup before any network round trip
+        discovery = await self._resolve_discovery_document()
+        userinfo_endpoint = discovery.get("userinfo_endpoint")
 
-        token_url, headers, body = self.oauth_client.prepare_token_request(
-            await self.token_endpoint,
+        oauth_client = self._make_oauth_client()
+        token_url, headers, body = oauth_client.prepare_token_request(
+            discovery.get("token_endpoint"),
             authorization_response=current_url,
-            redirect_url=redirect_uri or self.redirect_uri or current_path,
+            redirect_url=redirect_uri or self.redirect_uri or f"{url.scheme}://{url.netloc}{url.path}",
             code=code,
             **params,
         )  # type: ignore
@@ -550,20 +838,34 @@ class SSOBase:
 
         headers.update(additional_headers)
 
-        auth = httpx.BasicAuth(self.client_id, self.client_secret)
+        auth = self._get_basic_auth()
 
-        async with httpx.AsyncClient() as session:
+        async with self._http_session() as session:
             response = await session.post(token_url, headers=headers, content=body, auth=auth)
-            content = response.json()
-            self._refresh_token = content.get("refresh_token")
-            self._id_token = content.get("id_token")
-            self.oauth_client.parse_request_body_response(json.dumps(content))
-
-            uri, headers, _ = self.oauth_client.add_token(await self.userinfo_endpoint)
+            token = oauth_client.parse_request_body_response(response.text)
+            # Only publish the client once it holds this login's token, for `access_token` and `refresh_token`
+            self._oauth_client = oauth_client
+            self._refresh_token = token.get("refresh_token")
+            self._id_token = token.get("id_token")
+
+            if (
+                oauth_client.access_token
+                and oauth_client.token_type.lower() == "bearer"
+                and is_secure_transport(userinfo_endpoint)
+            ):
+                # The token was issued just now, so oauthlib's token type dispatch and expiry check have nothing to add
+                uri, headers = userinfo_endpoint, {"Authorization": f"Bearer {oauth_client.access_token}"}
+            else:
+                uri, headers, _ = oauth_client.add_token(userinfo_endpoint)
             headers.update(additional_headers)
-            session.headers.update(headers)
-            response = await session.get(uri)
-            content = response.json()
-            if convert_response:
-                return await self.openid_from_response(content, session)
-            return content
+            self._auth_headers = headers
+            response = await session.get(uri, headers=headers)
+            content = json_from_response(response)
+            if not convert_response:
+                return content
+            # Authenticate requests made by openid_from_response, without touching the caller's shared client
+            if session is self.http_client:
+                session = cast(httpx.AsyncClient, _AuthenticatedClient(session, headers))
+            else:
+                session.headers.update(headers)
+            return await self.openid_from_response(content, session)
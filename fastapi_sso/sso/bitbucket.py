@@ -1,13 +1,11 @@
 """BitBucket SSO Oauth Helper class"""
 
-from typing import TYPE_CHECKING, ClassVar, List, Optional, Union
+from typing import ClassVar, List, Optional, Union
 
+import httpx
 import pydantic
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
-
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase, json_from_response
 
 
 class BitbucketSSO(SSOBase):
@@ -24,6 +22,8 @@ class BitbucketSSO(SSOBase):
         redirect_uri: Optional[Union[pydantic.AnyHttpUrl, str]] = None,
         allow_insecure_http: bool = False,
         scope: Optional[List[str]] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        discovery_ttl: Optional[float] = None,
     ):
         super().__init__(
             client_id=client_id,
@@ -31,15 +31,17 @@ class BitbucketSSO(SSOBase):
             redirect_uri=redirect_uri,
             allow_insecure_http=allow_insecure_http,
             scope=scope,
+            http_client=http_client,
+            discovery_ttl=discovery_ttl,
         )
 
-    async def get_useremail(self, session: Optional["httpx.AsyncClient"] = None) -> dict:
+    async def get_useremail(self, session: Optional[httpx.AsyncClient] = None) -> dict:
         """Get user email"""
         if session is None:
             raise ValueError("Session is required to make HTTP requests")
 
         response = await session.get(f"https://api.bitbucket.org/{self.version}/user/emails")
-        return response.json()
+        return json_from_response(response)
 
     async def get_discovery_document(self) -> DiscoveryDocument:
         return {
@@ -48,13 +50,17 @@ class BitbucketSSO(SSOBase):
             "userinfo_endpoint": f"https://api.bitbucket.org/{self.version}/user",
         }
 
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         email = await self.get_useremail(session=session)
+        try:
+            picture = response["links"]["avatar"]["href"]
+        except (KeyError, TypeError):
+            picture = None
         return OpenID(
             email=email["values"][0]["email"],
             display_name=response.get("display_name"),
             provider=self.provider,
             id=str(response.get("uuid")).strip("{}"),
             first_name=response.get("nickname"),
-            picture=response.get("links", {}).get("avatar", {}).get("href"),
+            picture=picture,
         )
@@ -1,13 +1,13 @@
 """Discord SSO Oauth Helper class"""
 
-from typing import TYPE_CHECKING, ClassVar, List, Optional, Union
+from typing import ClassVar, List, Optional, Union
 
+import httpx
 import pydantic
 
 from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+_AVATAR_URL = "https://cdn.discordapp.com/avatars/%s/%s.png"
 
 
 class DiscordSSO(SSOBase):
@@ -15,6 +15,11 @@ class DiscordSSO(SSOBase):
 
     provider = "discord"
     scope: ClassVar = ["identify", "email", "openid"]
+    discovery_document: ClassVar[DiscoveryDocument] = {
+        "authorization_endpoint": "https://discord.com/oauth2/authorize",
+        "token_endpoint": "https://discord.com/api/oauth2/token",
+        "userinfo_endpoint": "https://discord.com/api/users/@me",
+    }
 
     def __init__(
         self,
@@ -23,6 +28,8 @@ class DiscordSSO(SSOBase):
         redirect_uri: Optional[Union[pydantic.AnyHttpUrl, str]] = None,
         allow_insecure_http: bool = False,
         scope: Optional[List[str]] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        discovery_ttl: Optional[float] = None,
     ):
         super().__init__(
             client_id=client_id,
@@ -30,21 +37,14 @@ class DiscordSSO(SSOBase):
             redirect_uri=redirect_uri,
             allow_insecure_http=allow_insecure_http,
             scope=scope,
+            http_client=http_client,
+            discovery_ttl=discovery_ttl,
         )
 
-    async def get_discovery_document(self) -> DiscoveryDocument:
-        return {
-            "authorization_endpoint": "https://discord.com/oauth2/authorize",
-            "token_endpoint": "https://discord.com/api/oauth2/token",
-            "userinfo_endpoint": "https://discord.com/api/users/@me",
-        }
-
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         user_id = response.get("id")
         avatar = response.get("avatar")
-        picture = None
-        if user_id and avatar:
-            picture = f"https://cdn.discordapp.com/avatars/{user_id}/{avatar}.png"
+        picture = _AVATAR_URL % (user_id, avatar) if user_id and avatar else None
 
         return OpenID(
             email=response.get("email"),
@@ -1,11 +1,10 @@
 """Facebook SSO Login Helper."""
 
-from typing import TYPE_CHECKING, ClassVar, Optional
+from typing import ClassVar, Optional
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
+import httpx
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
 
 
 class FacebookSSO(SSOBase):
@@ -23,8 +22,12 @@ class FacebookSSO(SSOBase):
             "userinfo_endpoint": f"{self.base_url}/me?fields=id,name,email,first_name,last_name,picture",
         }
 
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         """Return OpenID from user information provided by Facebook."""
+        try:
+            picture = response["picture"]["data"]["url"]
+        except (KeyError, TypeError):
+            picture = None
 
         return OpenID(
             email=response.get("email"),
@@ -33,5 +36,5 @@ class FacebookSSO(SSOBase):
             display_name=response.get("name"),
             provider=self.provider,
             id=response.get("id"),
-            picture=response.get("picture", {}).get("data", {}).get("url", None),
+            picture=picture,
         )
@@ -1,11 +1,10 @@
 """Fitbit OAuth Login Helper."""
 
-from typing import TYPE_CHECKING, ClassVar, Optional
+from typing import ClassVar, Optional
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase, SSOLoginError
+import httpx
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase, SSOLoginError
 
 
 class FitbitSSO(SSOBase):
@@ -13,8 +12,13 @@ class FitbitSSO(SSOBase):
 
     provider = "fitbit"
     scope: ClassVar = ["profile"]
+    discovery_document: ClassVar[DiscoveryDocument] = {
+        "authorization_endpoint": "https://www.fitbit.com/oauth2/authorize?response_type=code",
+        "token_endpoint": "https://api.fitbit.com/oauth2/token",
+        "userinfo_endpoint": "https://api.fitbit.com/1/user/-/profile.json",
+    }
 
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         """Return OpenID from user information provided by Google."""
         info = response.get("user")
         if not info:
@@ -26,11 +30,3 @@ class FitbitSSO(SSOBase):
             picture=info["avatar"],
             provider=self.provider,
         )
-
-    async def get_discovery_document(self) -> DiscoveryDocument:
-        """Get document containing handy urls."""
-        return {
-            "authorization_endpoint": "https://www.fitbit.com/oauth2/authorize?response_type=code",
-            "token_endpoint": "https://api.fitbit.com/oauth2/token",
-            "userinfo_endpoint": "https://api.fitbit.com/1/user/-/profile.json",
-        }
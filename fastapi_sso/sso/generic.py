@@ -3,12 +3,11 @@ with close to no code.
 """
 
 import logging
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
+import httpx
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +17,7 @@ def create_provider(
     name: str = "generic",
     default_scope: Optional[List[str]] = None,
     discovery_document: Union[DiscoveryDocument, Callable[[SSOBase], DiscoveryDocument]],
-    response_convertor: Optional[Callable[[Dict[str, Any], Optional["httpx.AsyncClient"]], OpenID]] = None
+    response_convertor: Optional[Callable[[Dict[str, Any], Optional[httpx.AsyncClient]], OpenID]] = None
 ) -> Type[SSOBase]:
     """A factory to create a generic OAuth client usable with almost any OAuth provider.
     Returns a class.
@@ -28,7 +27,9 @@ def create_provider(
         default_scope: default list of scopes (can be overriden in constructor)
         discovery_document: a dictionary containing discovery document or a callable returning it
         response_convertor: a callable that will receive JSON response from the userinfo endpoint
-            and should return OpenID object
+            and should return OpenID object. When a shared `http_client` is used, the session it receives
+            is a proxy forwarding attributes and request methods, not an `httpx.AsyncClient` instance,
+            and it cannot be used with `async with`
 
     Example:
         ```python
@@ -63,7 +64,7 @@ def create_provider(
                 return discovery_document(self)
             return discovery_document
 
-        async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+        async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
             if not response_convertor:
                 logger.warning("No response convertor was provided, returned OpenID will always be empty")
                 return OpenID(
@@ -1,11 +1,10 @@
 """Github SSO Oauth Helper class."""
 
-from typing import TYPE_CHECKING, ClassVar, Optional
+from typing import ClassVar, Optional
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
+import httpx
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase, json_from_response
 
 
 class GithubSSO(SSOBase):
@@ -13,17 +12,15 @@ class GithubSSO(SSOBase):
 
     provider = "github"
     scope: ClassVar = ["user:email"]
+    discovery_document: ClassVar[DiscoveryDocument] = {
+        "authorization_endpoint": "https://github.com/login/oauth/authorize",
+        "token_endpoint": "https://github.com/login/oauth/access_token",
+        "userinfo_endpoint": "https://api.github.com/user",
+    }
     additional_headers: ClassVar = {"accept": "application/json"}
     emails_endpoint = "https://api.github.com/user/emails"
 
-    async def get_discovery_document(self) -> DiscoveryDocument:
-        return {
-            "authorization_endpoint": "https://github.com/login/oauth/authorize",
-            "token_endpoint": "https://github.com/login/oauth/access_token",
-            "userinfo_endpoint": "https://api.github.com/user",
-        }
-
-    async def _get_primary_email(self, session: Optional["httpx.AsyncClient"] = None) -> Optional[str]:
+    async def _get_primary_email(self, session: Optional[httpx.AsyncClient] = None) -> Optional[str]:
         """Attempt to get primary email from Github for a current user.
         The session received must be authenticated.
         """
@@ -32,13 +29,10 @@ class GithubSSO(SSOBase):
         response = await session.get(self.emails_endpoint)
         if response.status_code != 200:
             return None
-        emails = response.json()
-        for email in emails:
-            if email["primary"]:
-                return email["email"]
-        return None
+        emails = json_from_response(response)
+        return next((email["email"] for email in emails if email["primary"]), None)
 
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         return OpenID(
             email=response.get("email") or (await self._get_primary_email(session)),
             provider=self.provider,
@@ -1,15 +1,13 @@
 """Gitlab SSO Oauth Helper class."""
 
-from typing import TYPE_CHECKING, ClassVar, List, Optional, Tuple, Union
+from typing import ClassVar, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
+import httpx
 import pydantic
 
 from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
-
 
 class GitlabSSO(SSOBase):
     """Class providing login via Gitlab SSO."""
@@ -28,6 +26,8 @@ class GitlabSSO(SSOBase):
         use_state: bool = False,  # TODO: Remove use_state argument
         scope: Optional[List[str]] = None,
         base_endpoint_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        discovery_ttl: Optional[float] = None,
     ) -> None:
         super().__init__(
             client_id,
@@ -36,6 +36,8 @@ class GitlabSSO(SSOBase):
             allow_insecure_http,
             use_state,  # TODO: Remove use_state argument
             scope,
+            http_client,
+            discovery_ttl,
         )
         self.base_endpoint_url = base_endpoint_url or self.base_endpoint_url
 
@@ -54,14 +56,11 @@ class GitlabSSO(SSOBase):
 
         name_parts = full_name.split()
 
-        if len(name_parts) == 1:
-            return name_parts[0], None
-
-        first_name = name_parts[0]
-        last_name = " ".join(name_parts[1:])
-        return first_name, last_name
+        if not name_parts:
+            return None, None
+        return name_parts[0], " ".join(name_parts[1:]) or None
 
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         """Converts Gitlab user info response to OpenID object."""
         first_name, last_name = self._parse_name(response.get("name"))
 
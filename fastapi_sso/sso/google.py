@@ -14,7 +14,7 @@ class GoogleSSO(SSOBase):
     provider = "google"
     scope: ClassVar = ["openid", "email", "profile"]
 
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         """Return OpenID from user information provided by Google."""
         if response.get("email_verified"):
             return OpenID(
@@ -30,7 +30,4 @@ class GoogleSSO(SSOBase):
 
     async def get_discovery_document(self) -> DiscoveryDocument:
         """Get document containing handy urls."""
-        async with httpx.AsyncClient() as session:
-            response = await session.get(self.discovery_url)
-            content = response.json()
-            return content
+        return await self._fetch_shared_discovery_document(self.discovery_url)
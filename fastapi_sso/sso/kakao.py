@@ -1,11 +1,10 @@
 """Kakao SSO Oauth Helper class."""
 
-from typing import TYPE_CHECKING, ClassVar, Optional
+from typing import ClassVar, Optional
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
+import httpx
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
 
 
 class KakaoSSO(SSOBase):
@@ -22,5 +21,5 @@ class KakaoSSO(SSOBase):
             "userinfo_endpoint": f"https://kapi.kakao.com/{self.version}/user/me",
         }
 
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         return OpenID(display_name=response["properties"]["nickname"], provider=self.provider)
@@ -1,11 +1,8 @@
 """LinkedIn SSO Oauth Helper class."""
 
-from typing import TYPE_CHECKING, ClassVar, Dict, Optional
+from typing import ClassVar, Dict, Optional
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
-
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, SSOBase
 
 
 class LinkedInSSO(SSOBase):
@@ -13,25 +10,24 @@ class LinkedInSSO(SSOBase):
 
     provider = "linkedin"
     scope: ClassVar = ["openid", "profile", "email"]
+    _openid_field_map: ClassVar = {
+        "id": "sub",
+        "email": "email",
+        "first_name": "given_name",
+        "last_name": "family_name",
+        "picture": "picture",
+    }
+    discovery_document: ClassVar[DiscoveryDocument] = {
+        "authorization_endpoint": "https://www.linkedin.com/oauth/v2/authorization",
+        "token_endpoint": "https://www.linkedin.com/oauth/v2/accessToken",
+        "userinfo_endpoint": "https://api.linkedin.com/v2/userinfo",
+    }
     additional_headers: ClassVar = {"accept": "application/json"}
+    _secret_query_params: Optional[Dict[str, str]] = None
 
     @property
     def _extra_query_params(self) -> Dict:
-        return {"client_secret": self.client_secret}
-
-    async def get_discovery_document(self) -> DiscoveryDocument:
-        return {
-            "authorization_endpoint": "https://www.linkedin.com/oauth/v2/authorization",
-            "token_endpoint": "https://www.linkedin.com/oauth/v2/accessToken",
-            "userinfo_endpoint": "https://api.linkedin.com/v2/userinfo",
-        }
-
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
-        return OpenID(
-            email=response.get("email"),
-            provider=self.provider,
-            id=response.get("sub"),
-            first_name=response.get("given_name"),
-            last_name=response.get("family_name"),
-            picture=response.get("picture"),
-        )
+        """Returns the client secret as a query param, built only once per secret."""
+        if self._secret_query_params is None or self._secret_query_params["client_secret"] != self.client_secret:
+            self._secret_query_params = {"client_secret": self.client_secret}
+        return self._secret_query_params
@@ -1,13 +1,11 @@
 """Microsoft SSO Oauth Helper class."""
 
-from typing import TYPE_CHECKING, ClassVar, List, Optional, Union
+from typing import ClassVar, List, Optional, Union
 
+import httpx
 import pydantic
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
-
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, SSOBase
 
 
 class MicrosoftSSO(SSOBase):
@@ -15,6 +13,13 @@ class MicrosoftSSO(SSOBase):
 
     provider = "microsoft"
     scope: ClassVar = ["openid", "User.Read", "email"]
+    _openid_field_map: ClassVar = {
+        "id": "id",
+        "email": "mail",
+        "first_name": "givenName",
+        "last_name": "surname",
+        "display_name": "displayName",
+    }
     version = "v1.0"
     tenant: str = "common"
 
@@ -27,6 +32,8 @@ class MicrosoftSSO(SSOBase):
         use_state: bool = False,  # TODO: Remove use_state argument
         scope: Optional[List[str]] = None,
         tenant: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        discovery_ttl: Optional[float] = None,
     ):
         super().__init__(
             client_id=client_id,
@@ -35,6 +42,8 @@ class MicrosoftSSO(SSOBase):
             allow_insecure_http=allow_insecure_http,
             use_state=use_state,  # TODO: Remove use_state argument
             scope=scope,
+            http_client=http_client,
+            discovery_ttl=discovery_ttl,
         )
         self.tenant = tenant or self.tenant
 
@@ -44,13 +53,3 @@ class MicrosoftSSO(SSOBase):
             "token_endpoint": f"https://login.microsoftonline.com/{self.tenant}/oauth2/v2.0/token",
             "userinfo_endpoint": f"https://graph.microsoft.com/{self.version}/me",
         }
-
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
-        return OpenID(
-            email=response.get("mail"),
-            display_name=response.get("displayName"),
-            provider=self.provider,
-            id=response.get("id"),
-            first_name=response.get("givenName"),
-            last_name=response.get("surname"),
-        )
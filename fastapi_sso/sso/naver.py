@@ -1,11 +1,10 @@
 """Naver SSO Oauth Helper class."""
 
-from typing import TYPE_CHECKING, ClassVar, List, Optional
+from typing import ClassVar, List, Optional
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
+import httpx
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
 
 
 class NaverSSO(SSOBase):
@@ -13,16 +12,14 @@ class NaverSSO(SSOBase):
 
     provider = "naver"
     scope: ClassVar[List[str]] = []
+    discovery_document: ClassVar[DiscoveryDocument] = {
+        "authorization_endpoint": "https://nid.naver.com/oauth2.0/authorize",
+        "token_endpoint": "https://nid.naver.com/oauth2.0/token",
+        "userinfo_endpoint": "https://openapi.naver.com/v1/nid/me",
+    }
     additional_headers: ClassVar = {"accept": "application/json"}
 
-    async def get_discovery_document(self) -> DiscoveryDocument:
-        return {
-            "authorization_endpoint": "https://nid.naver.com/oauth2.0/authorize",
-            "token_endpoint": "https://nid.naver.com/oauth2.0/token",
-            "userinfo_endpoint": "https://openapi.naver.com/v1/nid/me",
-        }
-
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         return OpenID(
             id=response["response"]["id"],
             email=response["response"].get("email"),
@@ -1,11 +1,10 @@
 """Notion SSO Oauth Helper class."""
 
-from typing import TYPE_CHECKING, ClassVar, Optional
+from typing import ClassVar, Optional
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase, SSOLoginError
+import httpx
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase, SSOLoginError
 
 
 class NotionSSO(SSOBase):
@@ -13,16 +12,14 @@ class NotionSSO(SSOBase):
 
     provider = "notion"
     scope: ClassVar = ["openid"]
+    discovery_document: ClassVar[DiscoveryDocument] = {
+        "authorization_endpoint": "https://api.notion.com/v1/oauth/authorize?owner=user",
+        "token_endpoint": "https://api.notion.com/v1/oauth/token",
+        "userinfo_endpoint": "https://api.notion.com/v1/users/me",
+    }
     additional_headers: ClassVar = {"Notion-Version": "2022-06-28"}
 
-    async def get_discovery_document(self) -> DiscoveryDocument:
-        return {
-            "authorization_endpoint": "https://api.notion.com/v1/oauth/authorize?owner=user",
-            "token_endpoint": "https://api.notion.com/v1/oauth/token",
-            "userinfo_endpoint": "https://api.notion.com/v1/users/me",
-        }
-
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         owner = response["bot"]["owner"]
         if owner["type"] != "user":
             raise SSOLoginError(401, f"Notion login failed, owner is not a user but {response['bot']['owner']['type']}")
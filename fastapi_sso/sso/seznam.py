@@ -1,12 +1,8 @@
 """Seznam SSO Login Helper."""
 
-from typing import TYPE_CHECKING, ClassVar, Optional
-
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
-
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from typing import ClassVar
 
+from fastapi_sso.sso.base import DiscoveryDocument, SSOBase
 
 # https://vyvojari.seznam.cz/oauth/doc
 
@@ -17,6 +13,14 @@ class SeznamSSO(SSOBase):
     provider = "seznam"
     base_url = "https://login.szn.cz/api/v1"
     scope: ClassVar = ["identity", "avatar"]  # + ["contact-phone", "adulthood", "birthday", "gender"]
+    _openid_field_map: ClassVar = {
+        "id": "oauth_user_id",
+        "email": "email",
+        "first_name": "firstname",
+        "last_name": "lastname",
+        "display_name": "accountDisplayName",
+        "picture": "avatar_url",
+    }
 
     async def get_discovery_document(self) -> DiscoveryDocument:
         """Get document containing handy urls."""
@@ -25,15 +29,3 @@ class SeznamSSO(SSOBase):
             "token_endpoint": f"{self.base_url}/oauth/token",
             "userinfo_endpoint": f"{self.base_url}/user",
         }
-
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
-        """Return OpenID from user information provided by Seznam."""
-        return OpenID(
-            email=response.get("email"),
-            first_name=response.get("firstname"),
-            last_name=response.get("lastname"),
-            display_name=response.get("accountDisplayName"),
-            provider=self.provider,
-            id=response.get("oauth_user_id"),
-            picture=response.get("avatar_url"),
-        )
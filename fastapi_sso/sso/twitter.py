@@ -1,11 +1,10 @@
 """Twitter (X) SSO Oauth Helper class."""
 
-from typing import TYPE_CHECKING, ClassVar, Optional
+from typing import ClassVar, Optional
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
+import httpx
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
 
 
 class TwitterSSO(SSOBase):
@@ -13,17 +12,15 @@ class TwitterSSO(SSOBase):
 
     provider = "twitter"
     scope: ClassVar = ["users.read", "tweet.read"]
+    discovery_document: ClassVar[DiscoveryDocument] = {
+        "authorization_endpoint": "https://twitter.com/i/oauth2/authorize",
+        "token_endpoint": "https://api.twitter.com/2/oauth2/token",
+        "userinfo_endpoint": "https://api.twitter.com/2/users/me",
+    }
     uses_pkce = True
     requires_state = True
 
-    async def get_discovery_document(self) -> DiscoveryDocument:
-        return {
-            "authorization_endpoint": "https://twitter.com/i/oauth2/authorize",
-            "token_endpoint": "https://api.twitter.com/2/oauth2/token",
-            "userinfo_endpoint": "https://api.twitter.com/2/users/me",
-        }
-
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         first_name, *last_name_parts = response["data"].get("name", "").split(" ")
         last_name = " ".join(last_name_parts) if last_name_parts else None
         return OpenID(
@@ -1,11 +1,10 @@
 """Yandex SSO Login Helper."""
 
-from typing import TYPE_CHECKING, ClassVar, Optional
+from typing import ClassVar, Optional
 
-from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
+import httpx
 
-if TYPE_CHECKING:
-    import httpx  # pragma: no cover
+from fastapi_sso.sso.base import DiscoveryDocument, OpenID, SSOBase
 
 
 class YandexSSO(SSOBase):
@@ -13,17 +12,14 @@ class YandexSSO(SSOBase):
 
     provider = "yandex"
     scope: ClassVar = ["login:email", "login:info", "login:avatar"]
+    discovery_document: ClassVar[DiscoveryDocument] = {
+        "authorization_endpoint": "https://oauth.yandex.ru/authorize",
+        "token_endpoint": "https://oauth.yandex.ru/token",
+        "userinfo_endpoint": "https://login.yandex.ru/info",
+    }
     avatar_url = "https://avatars.yandex.net/get-yapic"
 
-    async def get_discovery_document(self) -> DiscoveryDocument:
-        """Override the discovery document method to return Yandex OAuth endpoints."""
-        return {
-            "authorization_endpoint": "https://oauth.yandex.ru/authorize",
-            "token_endpoint": "https://oauth.yandex.ru/token",
-            "userinfo_endpoint": "https://login.yandex.ru/info",
-        }
-
-    async def openid_from_response(self, response: dict, session: Optional["httpx.AsyncClient"] = None) -> OpenID:
+    async def openid_from_response(self, response: dict, session: Optional[httpx.AsyncClient] = None) -> OpenID:
         """Converts Yandex user info response to OpenID object."""
         picture = None
 
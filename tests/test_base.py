@@ -3,9 +3,46 @@
 import os
 
 import pytest
-from utils import Request
+from oauthlib.oauth2 import InsecureTransportError, WebApplicationClient
+from starlette.responses import RedirectResponse
+from utils import Request, Response, make_fake_async_client
 
-from fastapi_sso.sso.base import SecurityWarning, SSOBase, SSOLoginError, UnsetStateWarning, requires_async_context
+from fastapi_sso.sso.base import (
+    OpenID,
+    SecurityWarning,
+    SSOBase,
+    SSOLoginError,
+    UnsetStateWarning,
+    json_from_response,
+    requires_async_context,
+)
+from fastapi_sso.sso.generic import create_provider
+
+DISCOVERY_DOCUMENT = {
+    "authorization_endpoint": "https://example.com/auth",
+    "token_endpoint": "https://example.com/token",
+    "userinfo_endpoint": "https://example.com/userinfo",
+}
+
+
+@pytest.fixture(name="Provider")
+def generic_provider():
+    """A fresh generic provider for each test, so that tests may change its class attributes"""
+    return create_provider(discovery_document=DISCOVERY_DOCUMENT)
+
+
+@pytest.fixture
+def mock_token_response(monkeypatch: pytest.MonkeyPatch):
+    """Makes `httpx.AsyncClient` respond to the token request with the given token and to any other with `{}`"""
+
+    def _mock_token_response(token=None):
+        token = token or {"access_token": "token", "token_type": "Bearer"}
+        monkeypatch.setattr(
+            "httpx.AsyncClient",
+            make_fake_async_client(returns_post=Response(json_content=token), returns_get=Response()),
+        )
+
+    return _mock_token_response
 
 
 class TestSSOBase:
@@ -35,6 +72,21 @@ class TestSSOBase:
             sso = SSOBase("client_id", "client_secret")
             sso.state
 
+    def test_state_warning_is_emitted_once(self, recwarn: pytest.WarningsRecorder):
+        sso = SSOBase("client_id", "client_secret")
+        assert sso.state is None
+        assert sso.state is None
+        assert len([warning for warning in recwarn if warning.category is UnsetStateWarning]) == 1
+
+    async def test_state_warning_is_emitted_once_per_login_flow(self):
+        sso = SSOBase("client_id", "client_secret")
+        for _ in range(2):
+            async with sso:
+                with pytest.warns(UnsetStateWarning) as record:
+                    assert sso.state is None
+                    assert sso.state is None
+                assert len([warning for warning in record if warning.category is UnsetStateWarning]) == 1
+
     def test_deprecated_use_state_warning(self):
         with pytest.warns(DeprecationWarning):
             SSOBase("client_id", "client_secret", use_state=True)
@@ -74,6 +126,11 @@ class TestSSOBase:
         SSOBase("client_id", "client_secret", allow_insecure_http=True)
         assert os.getenv("OAUTHLIB_INSECURE_TRANSPORT"), "OAUTHLIB_INSECURE_TRANSPORT should be truthy after test"
 
+    def test_insecure_transport_env_var_is_not_overwritten(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("OAUTHLIB_INSECURE_TRANSPORT", "true")
+        SSOBase("client_id", "client_secret", allow_insecure_http=True)
+        assert os.environ["OAUTHLIB_INSECURE_TRANSPORT"] == "true"
+
     def test_warns_on_sync_context(self):
         sso = SSOBase("client_id", "client_secret")
         with pytest.warns(DeprecationWarning, match="SSO Providers are supposed to be used in async context"), sso:
@@ -101,3 +158,256 @@ class TestSSOBase:
             method(sso)
 
         assert function(42) == 42
+
+    async def test_local_discovery_document_is_not_cached(self):
+        calls = []
+
+        class Provider(SSOBase):
+            async def get_discovery_document(self):
+                calls.append(1)
+                return DISCOVERY_DOCUMENT
+
+        sso = Provider("client_id", "client_secret")
+        assert await sso.authorization_endpoint == "https://example.com/auth"
+        assert await sso.token_endpoint == "https://example.com/token"
+        assert len(calls) == 2
+
+    @pytest.mark.parametrize(
+        ("userinfo_endpoint", "error"),
+        [("https://example.com/userinfo", None), ("", "missing 'userinfo_endpoint'"), ("http://example.com", "https")],
+    )
+    async def test_prefetch_discovery_document(self, monkeypatch, userinfo_endpoint: str, error: str):
+        monkeypatch.delenv("OAUTHLIB_INSECURE_TRANSPORT", raising=False)
+        document = {**DISCOVERY_DOCUMENT, "userinfo_endpoint": userinfo_endpoint}
+        sso = create_provider(discovery_document=document)("client_id", "client_secret")
+        if error:
+            with pytest.raises(ValueError, match=error):
+                await sso.prefetch_discovery_document()
+        else:
+            assert await sso.prefetch_discovery_document() == document
+
+    async def test_static_discovery_document(self):
+        class StaticProvider(SSOBase):
+            discovery_document = DISCOVERY_DOCUMENT
+
+        sso = StaticProvider("client_id", "client_secret")
+        returned = await sso.get_discovery_document()
+        assert returned == DISCOVERY_DOCUMENT
+        returned["userinfo_endpoint"] = "https://example.com/changed"
+        assert await sso.userinfo_endpoint == "https://example.com/userinfo"
+
+    async def test_login_url_does_not_store_oauth_client(self, Provider):
+        sso = Provider("client_id", "client_secret", redirect_uri="https://localhost/callback")
+        async with sso:
+            assert (await sso.get_login_url()).startswith("https://example.com/auth")
+            assert sso._oauth_client is None
+
+    def test_basic_auth_is_reused(self):
+        sso = SSOBase("client_id", "client_secret")
+        auth = sso._get_basic_auth()
+        assert sso._get_basic_auth() is auth
+        sso.client_secret = "rotated"
+        assert sso._get_basic_auth() is not auth
+
+    async def test_login_redirect_pkce_cookie(self, Provider):
+        Provider.uses_pkce = True
+        sso = Provider("client_id", "client_secret", redirect_uri="https://localhost/callback")
+        async with sso:
+            response = await sso.get_login_redirect()
+            expected = RedirectResponse("https://example.com/auth", 303)
+            expected.set_cookie("pkce_code_verifier", sso._pkce_code_verifier)
+        assert response.headers.getlist("set-cookie") == expected.headers.getlist("set-cookie")
+
+    async def test_openid_field_map(self):
+        class Provider(SSOBase):
+            provider = "mapped"
+            _openid_field_map = {"id": "sub", "email": "mail", "display_name": "name"}
+
+        sso = Provider("client_id", "client_secret")
+        openid = await sso.openid_from_response({"sub": "1", "mail": "test@example.com", "other": "ignored"})
+        assert openid == OpenID(id="1", email="test@example.com", provider="mapped")
+
+    def test_openid_field_map_unknown_field(self):
+        with pytest.raises(ValueError, match="unknown OpenID fields: mail, provider"):
+
+            class Provider(SSOBase):
+                _openid_field_map = {"id": "sub", "mail": "mail", "provider": "iss"}
+
+    @pytest.mark.parametrize(
+        ("authorization_endpoint", "use_pkce", "params"),
+        [
+            ("https://example.com/auth", False, {}),
+            ("https://example.com/auth?owner=user", False, {"prompt": "consent", "empty": None}),
+            ("https://example.com/auth?response_type=code", True, {"login_hint": "test@example.com"}),
+            ("https://example.com/auth?owner=user#fragment", False, {"prompt": "consent"}),
+        ],
+    )
+    async def test_login_url_matches_oauthlib(self, authorization_endpoint: str, use_pkce: bool, params: dict):
+        Provider = create_provider(
+            discovery_document={**DISCOVERY_DOCUMENT, "authorization_endpoint": authorization_endpoint},
+            default_scope=["openid", "email"],
+        )
+        Provider.uses_pkce = use_pkce
+        sso = Provider("client_id", "client_secret", redirect_uri="https://localhost/callback?next=/")
+        async with sso:
+            login_url = await sso.get_login_url(params=dict(params), state="state")
+            expected = WebApplicationClient("client_id").prepare_request_uri(
+                authorization_endpoint,
+                redirect_uri="https://localhost/callback?next=/",
+                state="state",
+                scope=["openid", "email"],
+                code_challenge=sso._pkce_code_challenge,
+                code_challenge_method="S256",
+                **params,
+            )
+        assert login_url == expected
+
+    async def test_login_url_requires_secure_transport(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv("OAUTHLIB_INSECURE_TRANSPORT", raising=False)
+        Provider = create_provider(
+            discovery_document={**DISCOVERY_DOCUMENT, "authorization_endpoint": "http://example.com/auth"}
+        )
+        sso = Provider("client_id", "client_secret", redirect_uri="https://localhost/callback")
+        async with sso:
+            with pytest.raises(InsecureTransportError):
+                await sso.get_login_url()
+
+    async def test_shared_http_client(self, Provider):
+        class SharedClient:
+            def __init__(self):
+                self.headers = {}
+                self.requests = []
+                self.closed = False
+
+            async def post(self, url, **kwargs):
+                self.requests.append(("POST", url, kwargs))
+                return Response(json_content={"access_token": "token"})
+
+            async def get(self, url, **kwargs):
+                self.requests.append(("GET", url, kwargs))
+                return Response(json_content={"id": "test"})
+
+            async def aclose(self):
+                self.closed = True
+
+        client = SharedClient()
+        sso = Provider("client_id", "client_secret", http_client=client)
+        async with sso:
+            response = await sso.process_login(
+                "code", Request(url="https://localhost?code=code"), convert_response=False
+            )
+        assert response == {"id": "test"}
+        assert [(method, url) for method, url, _ in client.requests] == [
+            ("POST", "https://example.com/token"),
+            ("GET", "https://example.com/userinfo"),
+        ]
+        assert client.requests[1][2]["headers"]["Authorization"] == "Bearer token"
+        assert client.headers == {}, "Shared client must not be authenticated for other requests"
+        assert not client.closed, "Shared client is owned by the caller and must not be closed"
+
+    async def test_shared_http_client_session_is_authenticated(self):
+        class SharedClient:
+            def __init__(self):
+                self.headers = {}
+                self.requests = []
+                self.timeout = 5.0
+
+            async def post(self, url, **kwargs):
+                return Response(json_content={"access_token": "token"})
+
+            async def get(self, url, headers=None):
+                self.requests.append((url, headers))
+                return Response(json_content={"id": "test"})
+
+        class EmailsProvider(SSOBase):
+            provider = "test"
+            discovery_document = DISCOVERY_DOCUMENT
+
+            async def openid_from_response(self, response, session=None):
+                assert session.headers["Authorization"] == self.auth_headers["Authorization"] == "Bearer token"
+                assert session.timeout == 5.0
+                await session.get("https://example.com/emails", headers={"accept": "application/json"})
+                return OpenID(id=response["id"], provider=self.provider)
+
+        client = SharedClient()
+        sso = EmailsProvider("client_id", "client_secret", http_client=client)
+        async with sso:
+            openid = await sso.process_login("code", Request(url="https://localhost?code=code"))
+        assert openid.id == "test"
+        url, headers = client.requests[1]
+        assert url == "https://example.com/emails"
+        assert headers["Authorization"] == "Bearer token"
+        assert headers["accept"] == "application/json"
+        assert client.headers == {}, "Shared client must not be authenticated for other requests"
+
+    async def test_process_login_parses_token_response(self, Provider, mock_token_response):
+        token = {"access_token": "access", "refresh_token": "refresh", "id_token": "id", "token_type": "Bearer"}
+        mock_token_response(token)
+        sso = Provider("client_id", "client_secret")
+        async with sso:
+            await sso.process_login("code", Request(url="https://localhost?code=code"), convert_response=False)
+            assert sso.access_token == "access"
+            assert sso.refresh_token == "refresh"
+            assert sso.id_token == "id"
+
+    async def test_process_login_upgrades_only_scheme(
+        self, monkeypatch: pytest.MonkeyPatch, Provider, mock_token_response
+    ):
+        mock_token_response()
+        authorization_responses = []
+        prepare_token_request = WebApplicationClient.prepare_token_request
+
+        def spy(client, token_url, authorization_response=None, **kwargs):
+            authorization_responses.append(authorization_response)
+            return prepare_token_request(client, token_url, authorization_response=authorization_response, **kwargs)
+
+        monkeypatch.setattr(WebApplicationClient, "prepare_token_request", spy)
+        sso = Provider("client_id", "client_secret")
+        async with sso:
+            await sso.process_login(
+                "code",
+                Request(url="http://localhost/callback?code=code&next=http://localhost/"),
+                convert_response=False,
+            )
+        assert authorization_responses == ["https://localhost/callback?code=code&next=http://localhost/"]
+
+    async def test_process_login_does_not_mutate_arguments(self, Provider, mock_token_response):
+        Provider.additional_headers = {"accept": "application/json"}
+        mock_token_response()
+        params = {"audience": "api"}
+        headers = {"x-request-id": "1"}
+        sso = Provider("client_id", "client_secret")
+        async with sso:
+            await sso.process_login(
+                "code",
+                Request(url="https://localhost?code=code"),
+                params=params,
+                additional_headers=headers,
+                pkce_code_verifier="verifier",
+                convert_response=False,
+            )
+            assert sso._auth_headers["accept"] == "application/json"
+            assert sso._auth_headers["x-request-id"] == "1"
+        assert params == {"audience": "api"}
+        assert headers == {"x-request-id": "1"}
+        assert Provider.additional_headers == {"accept": "application/json"}
+
+    async def test_process_login_insecure_userinfo_endpoint(self, monkeypatch: pytest.MonkeyPatch, mock_token_response):
+        monkeypatch.delenv("OAUTHLIB_INSECURE_TRANSPORT", raising=False)
+        Provider = create_provider(
+            discovery_document={**DISCOVERY_DOCUMENT, "userinfo_endpoint": "http://example.com/userinfo"}
+        )
+        mock_token_response()
+        sso = Provider("client_id", "client_secret")
+        async with sso:
+            with pytest.raises(InsecureTransportError):
+                await sso.process_login("code", Request(url="https://localhost?code=code"), convert_response=False)
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_from_response(self, monkeypatch: pytest.MonkeyPatch, use_orjson: bool):
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr("fastapi_sso.sso.base.orjson", None)
+        content = {"id": "test", "nested": {"values": [1, 2]}}
+        assert json_from_response(Response(json_content=content)) == content
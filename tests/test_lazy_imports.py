@@ -0,0 +1,23 @@
+import importlib
+
+import pytest
+
+import fastapi_sso
+
+
+def test_lazy_provider_import():
+    from fastapi_sso.sso.google import GoogleSSO
+
+    assert fastapi_sso.GoogleSSO is GoogleSSO
+    assert "GoogleSSO" in dir(fastapi_sso)
+
+
+def test_all_exports_resolve():
+    module = importlib.import_module("fastapi_sso")
+    for name in module.__all__:
+        assert getattr(module, name) is not None
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        fastapi_sso.UnknownSSO  # noqa: B018
@@ -1,8 +1,10 @@
 from typing import Any, Dict, Tuple, Type
 
 import pytest
+from utils import Response, make_fake_async_client
 
 from fastapi_sso.sso.base import OpenID, SSOBase
+from fastapi_sso.sso.bitbucket import BitbucketSSO
 from fastapi_sso.sso.discord import DiscordSSO
 from fastapi_sso.sso.facebook import FacebookSSO
 from fastapi_sso.sso.fitbit import FitbitSSO
@@ -200,6 +202,11 @@ sso_test_cases: Tuple[Tuple[Type[SSOBase], Dict[str, Any], OpenID], ...] = (
             picture="https://myimage",
         ),
     ),
+    (
+        FacebookSSO,
+        {"email": "test@example.com", "name": "Test User", "id": "test", "picture": None},
+        OpenID(email="test@example.com", display_name="Test User", id="test", provider="facebook"),
+    ),
     (
         YandexSSO,
         {
@@ -238,6 +245,17 @@ sso_test_cases: Tuple[Tuple[Type[SSOBase], Dict[str, Any], OpenID], ...] = (
             display_name="Test User",
         ),
     ),
+    (
+        BitbucketSSO,
+        {"uuid": "{test}", "nickname": "testuser", "display_name": "Test User"},
+        OpenID(
+            email="test@example.com",
+            id="test",
+            first_name="testuser",
+            display_name="Test User",
+            provider="bitbucket",
+        ),
+    ),
 )
 
 
@@ -245,6 +263,9 @@ sso_test_cases: Tuple[Tuple[Type[SSOBase], Dict[str, Any], OpenID], ...] = (
 async def test_provider_openid_by_response(
     ProviderClass: Type[SSOBase], response: Dict[str, Any], openid: OpenID
 ) -> None:
+    session = make_fake_async_client(
+        returns_post=Response(), returns_get=Response(json_content={"values": [{"email": "test@example.com"}]})
+    )()
     sso = ProviderClass("client_id", "client_secret")
     async with sso:
-        assert await sso.openid_from_response(response) == openid
+        assert await sso.openid_from_response(response, session) == openid
@@ -1,8 +1,19 @@
+import base64
+import hashlib
+
 import pytest
 
-from fastapi_sso.pkce import get_code_verifier
+from fastapi_sso.pkce import get_code_verifier, get_pkce_challenge_pair
 
 
 @pytest.mark.parametrize(("requested", "expected"), [(100, 100), (20, 43), (200, 128)])
 def test_pkce_selected_length(requested: int, expected: int) -> None:
     assert expected == len(get_code_verifier(requested))
+
+
+def test_pkce_challenge_pair() -> None:
+    verifier, challenge = get_pkce_challenge_pair()
+    expected = base64.urlsafe_b64encode(hashlib.sha256(verifier.encode()).digest()).decode().rstrip("=")
+    assert challenge == expected
+    assert "=" not in verifier
+    assert "=" not in challenge
@@ -1,8 +1,9 @@
 # type: ignore
 
-from typing import Type
+from typing import Optional, Type, get_type_hints
 from urllib.parse import quote_plus
 
+import httpx
 import pytest
 from fastapi.responses import RedirectResponse
 from utils import AnythingDict, Request, Response, make_fake_async_client
@@ -73,6 +74,10 @@ def mock_google_dicscovery_document(monkeypatch: pytest.MonkeyPatch):
 
 
 class TestProviders:
+    def test_type_hints_resolve(self, Provider: Type[SSOBase]):
+        assert get_type_hints(Provider.__init__)["http_client"] == Optional[httpx.AsyncClient]
+        assert get_type_hints(Provider.openid_from_response)["session"] == Optional[httpx.AsyncClient]
+
     @pytest.mark.parametrize("item", ("authorization_endpoint", "token_endpoint", "userinfo_endpoint"))
     async def test_discovery_document(self, Provider: Type[SSOBase], item: str):
         sso = Provider("client_id", "client_secret")
@@ -1,8 +1,21 @@
+import asyncio
 from unittest.mock import MagicMock
 
+import httpx
 import pytest
+from utils import Response, make_fake_discovery_client
 
-from fastapi_sso import BitbucketSSO, NotionSSO, OpenID, SSOLoginError
+from fastapi_sso import (
+    BitbucketSSO,
+    GithubSSO,
+    GitlabSSO,
+    GoogleSSO,
+    LinkedInSSO,
+    MicrosoftSSO,
+    NotionSSO,
+    OpenID,
+    SSOLoginError,
+)
 
 
 async def test_notion_openid_response():
@@ -37,9 +50,10 @@ async def test_bitbucket_openid_response():
     }
 
     class FakeSesssion:
-        async def get(self, url: str) -> MagicMock:
+        async def get(self, url: str, headers=None) -> MagicMock:
             response = MagicMock()
             response.json.return_value = {"values": [{"email": "test@example.com"}]}
+            response.content = b'{"values": [{"email": "test@example.com"}]}'
             return response
 
     openid = OpenID(
@@ -55,3 +69,108 @@ async def test_bitbucket_openid_response():
         await sso.openid_from_response(valid_response)
 
     assert openid == await sso.openid_from_response(valid_response, FakeSesssion())
+
+
+async def test_overridden_discovery_document_is_used():
+    class GithubEnterpriseSSO(GithubSSO):
+        async def get_discovery_document(self):
+            return {
+                "authorization_endpoint": "https://github.example.com/login/oauth/authorize",
+                "token_endpoint": "https://github.example.com/login/oauth/access_token",
+                "userinfo_endpoint": "https://github.example.com/api/v3/user",
+            }
+
+    sso = GithubEnterpriseSSO("client_id", "client_secret", "https://localhost/callback")
+    assert (await sso.get_login_url()).startswith("https://github.example.com/login/oauth/authorize?")
+    assert await sso.token_endpoint == "https://github.example.com/login/oauth/access_token"
+
+
+async def test_discovery_document_follows_instance_attributes():
+    sso = MicrosoftSSO("client_id", "client_secret", "https://localhost/callback")
+    assert (await sso.get_login_url()).startswith("https://login.microsoftonline.com/common/")
+    sso.tenant = "mytenant"
+    assert (await sso.get_login_url()).startswith("https://login.microsoftonline.com/mytenant/")
+    assert await sso.token_endpoint == "https://login.microsoftonline.com/mytenant/oauth2/v2.0/token"
+
+
+@pytest.mark.parametrize(
+    ("full_name", "expected"),
+    [
+        (None, (None, None)),
+        ("   ", (None, None)),
+        ("John", ("John", None)),
+        (" John Ronald Tolkien ", ("John", "Ronald Tolkien")),
+        ("John  Ronald\t  Tolkien", ("John", "Ronald Tolkien")),
+    ],
+)
+def test_gitlab_parse_name(full_name, expected):
+    assert GitlabSSO("client_id", "client_secret")._parse_name(full_name) == expected
+
+
+def test_linkedin_extra_query_params():
+    sso = LinkedInSSO("client_id", "client_secret")
+    assert sso._extra_query_params == {"client_secret": "client_secret"}
+    params = sso._extra_query_params
+    assert sso._extra_query_params is params
+    sso.client_secret = "rotated"
+    assert sso._extra_query_params == {"client_secret": "rotated"}
+
+
+async def test_google_discovery_document_is_shared(monkeypatch: pytest.MonkeyPatch):
+    document = {
+        "authorization_endpoint": "https://example.com/auth",
+        "token_endpoint": "https://example.com/token",
+        "userinfo_endpoint": "https://example.com/userinfo",
+    }
+    responses = [Response(json_content={"error": "unavailable"}, is_success=False), Response(json_content=document)]
+    requested = []
+
+    monkeypatch.setattr("httpx.AsyncClient", make_fake_discovery_client(responses, requested))
+    monkeypatch.setattr("fastapi_sso.sso.base._shared_discovery_documents", {})
+
+    sso = GoogleSSO("client_id", "client_secret", "https://localhost/callback")
+    with pytest.raises(httpx.HTTPStatusError):
+        await sso.get_login_url()
+    assert await sso.get_login_url()
+    assert await GoogleSSO("client_id", "client_secret").get_discovery_document() == document
+    assert await GoogleSSO("other_client_id", "client_secret").get_discovery_document() == document
+    assert requested == [GoogleSSO.discovery_url, GoogleSSO.discovery_url]
+
+
+@pytest.mark.parametrize(
+    "failure", [Response(json_content={"error": "unavailable"}, is_success=False), httpx.ConnectError("down")]
+)
+async def test_google_expired_discovery_document_is_reused_on_error(monkeypatch: pytest.MonkeyPatch, failure):
+    document = {"token_endpoint": "https://example.com/token"}
+    responses = [Response(json_content=document), failure]
+
+    shared = {}
+    monkeypatch.setattr("httpx.AsyncClient", make_fake_discovery_client(responses))
+    monkeypatch.setattr("fastapi_sso.sso.base._shared_discovery_documents", shared)
+
+    sso = GoogleSSO("client_id", "client_secret")
+    assert await sso.token_endpoint == "https://example.com/token"
+    shared[GoogleSSO.discovery_url] = (document, 0.0)
+    assert await sso.token_endpoint == "https://example.com/token"
+    assert await sso.token_endpoint == "https://example.com/token"
+    assert responses == []
+
+    shared.clear()
+    responses.append(failure)
+    with pytest.raises((httpx.HTTPStatusError, httpx.ConnectError)):
+        await sso.token_endpoint
+
+
+async def test_google_discovery_document_is_fetched_once_concurrently(monkeypatch: pytest.MonkeyPatch):
+    document = {"token_endpoint": "https://example.com/token"}
+    responses = [Response(json_content=document), Response(json_content=document)]
+    requested = []
+    monkeypatch.setattr("httpx.AsyncClient", make_fake_discovery_client(responses, requested, delay=0.01))
+    monkeypatch.setattr("fastapi_sso.sso.base._shared_discovery_documents", {})
+
+    providers = [GoogleSSO("client_id", "client_secret", discovery_ttl=0) for _ in range(3)]
+    documents = await asyncio.gather(*(sso.get_discovery_document() for sso in providers))
+    assert documents == [document] * 3
+    assert requested == [GoogleSSO.discovery_url]
+    assert await providers[0].get_discovery_document() == document
+    assert len(requested) == 2
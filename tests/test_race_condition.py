@@ -2,6 +2,7 @@
 # Author: @parikls
 
 import asyncio
+import json
 from unittest.mock import Mock, patch
 
 from starlette.datastructures import URL
@@ -31,6 +32,14 @@ async def test__race_condition():
                 "id_token": self.token,
             }
 
+        @property
+        def text(self):
+            return json.dumps(self.json())
+
+        @property
+        def content(self):
+            return self.text.encode()
+
     # mock of the httpx client
     class AsyncClient:
         post_responses = []  # list of the responses which a client will return for the `POST` requests
@@ -1,3 +1,8 @@
+import asyncio
+import json
+from typing import Optional
+
+import httpx
 from starlette.datastructures import URL
 
 
@@ -9,13 +14,27 @@ class Request:
 
 
 class Response:
-    def __init__(self, url="http://localhost", json_content=None):
+    def __init__(self, url="http://localhost", json_content=None, is_success=True):
         self.url = URL(url)
         self.json_content = json_content or {}
+        self.is_success = is_success
 
     def json(self):
         return self.json_content
 
+    def raise_for_status(self):
+        if not self.is_success:
+            request = httpx.Request("GET", str(self.url))
+            raise httpx.HTTPStatusError("Unsuccessful response", request=request, response=self)
+
+    @property
+    def text(self):
+        return json.dumps(self.json_content, default=lambda anything: anything.data)
+
+    @property
+    def content(self):
+        return self.text.encode()
+
 
 class AnythingDict:
     def __init__(self, data=None):
@@ -52,3 +71,24 @@ def make_fake_async_client(returns_post: Response, returns_get: Response):
             return returns_post
 
     return FakeAsyncClient
+
+
+def make_fake_discovery_client(responses: list, requested: Optional[list] = None, delay: float = 0):
+    class FakeAsyncClient:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            return None
+
+        async def get(self, url):
+            if requested is not None:
+                requested.append(url)
+            if delay:
+                await asyncio.sleep(delay)
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+    return FakeAsyncClient